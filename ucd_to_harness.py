@@ -7,7 +7,7 @@ Harness YAMLs (services, environments, and a basic pipeline per UCD application)
 
 Usage:
   python ucd_to_harness.py --input <ucd_export_dir_or_zip> --output <out_dir> \
-    --project-id PROJ --org-id ORG [--deployment-type Kubernetes|Ssh|NativeHelm] [--dry-run]
+    --project-id PROJ --org-id ORG [--deployment-type Kubernetes|Ssh|NativeHelm] [--fast-yaml] [--dry-run]
 
 Notes & Assumptions:
 - Best-effort parsing of UCD exports. UCD exports vary by version & options.
@@ -17,98 +17,405 @@ Notes & Assumptions:
     * UCD Environment -> Harness Environment
     * UCD Processes (application/component) -> Pipeline steps (ShellScript placeholders)
 - You can edit the generated YAMLs later in Harness to refine infra, connectors, etc.
+- Optional speedups, used when installed: orjson/ujson (JSON parsing), ijson (incremental
+  parsing of very large export files), pyahocorasick (process/environment name matching).
 """
 
 import argparse
+import contextlib
+import functools
+import itertools
 import json
 import os
 import re
-import shutil
 import sys
-import tempfile
 import uuid
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import Dict, Any, List, Tuple
+from typing import Dict, Any, BinaryIO, Callable, Iterator, List, Optional, Tuple
 
-# Try to import PyYAML (preferred). Fallback to a tiny dumper.
+# Try to import PyYAML (preferred). Fallback to the built-in writer below.
 try:
     import yaml  # type: ignore
     HAVE_PYYAML = True
 except Exception:
     HAVE_PYYAML = False
 
+if HAVE_PYYAML:
+    # Prefer the libyaml-backed emitter when available; it is several times faster.
+    try:
+        from yaml import CSafeDumper as _BaseDumper  # type: ignore
+    except ImportError:
+        from yaml import SafeDumper as _BaseDumper  # type: ignore
+
+    class _Dumper(_BaseDumper):  # type: ignore
+        # build_pipeline_yaml shares one step list across its stages;
+        # always emit them inline rather than as &anchor/*alias pairs.
+        def ignore_aliases(self, data):
+            return True
+
+# Fastest available JSON parser: orjson, then ujson, then the stdlib.
+try:
+    import orjson  # type: ignore
+    _loads = orjson.loads
+except Exception:
+    try:
+        import ujson as _ujson  # type: ignore
+        _loads = _ujson.loads
+    except Exception:
+        _loads = json.loads
+
+# Optional: incremental parser for very large export files.
+try:
+    import ijson  # type: ignore
+    HAVE_IJSON = True
+except Exception:
+    HAVE_IJSON = False
+
+# Optional: Aho-Corasick automaton for multi-name substring search.
+try:
+    import ahocorasick  # type: ignore
+    HAVE_AHOCORASICK = True
+except Exception:
+    HAVE_AHOCORASICK = False
+
+# Marker type for strings that should be emitted in block-literal ('|') style
+class LiteralStr(str): pass
+
+def _repr_literal(dumper, data):
+    return dumper.represent_scalar('tag:yaml.org,2002:str', data, style='|')
+
+if HAVE_PYYAML:
+    # Registered once at import rather than on every to_yaml() call
+    _Dumper.add_representer(LiteralStr, _repr_literal)
+
+# Minimal block-style YAML writer for the restricted schema emitted here
+# (dict/list/str/int/bool/None). Used when PyYAML is unavailable or when the
+# fast writer is requested; output loads back to the same data via yaml.safe_load.
+_PLAIN_SAFE_RE = re.compile(r"[A-Za-z0-9_/][A-Za-z0-9_ ./()+=,'\"@$%&*!?<>~^|\\\[\]{}-]*")
+_IMPLICIT_TYPE_RE = re.compile(r"""(?x)
+    [-+]?(?:[0-9][0-9_]*)?\.?[0-9_]*(?:[eE][-+]?[0-9]+)?
+  | [-+]?\.(?:inf|Inf|INF) | \.(?:nan|NaN|NAN)
+  | 0b[01_]+ | 0x[0-9a-fA-F_]+
+  | [0-9]{4}-[0-9]{1,2}-[0-9]{1,2}.*
+  | y|Y|yes|Yes|YES|n|N|no|No|NO|true|True|TRUE|false|False|FALSE|on|On|ON|off|Off|OFF
+  | null|Null|NULL|~
+""")
+
+def _yaml_double_quoted(s: str) -> str:
+    out = ['"']
+    for ch in s:
+        if ch == '"' or ch == "\\":
+            out.append("\\" + ch)
+        elif ch.isprintable():
+            out.append(ch)
+        elif ord(ch) <= 0xFF:
+            out.append(f"\\x{ord(ch):02x}")
+        elif ord(ch) <= 0xFFFF:
+            out.append(f"\\u{ord(ch):04x}")
+        else:
+            out.append(f"\\U{ord(ch):08x}")
+    out.append('"')
+    return "".join(out)
+
+def _yaml_scalar(v: Any, indent: int, allow_block: bool = True) -> Tuple[str, List[str]]:
+    """Render a scalar as (text after 'key: ' or '- ', continuation lines at `indent`)."""
+    if v is None:
+        return "null", []
+    if isinstance(v, bool):
+        return ("true" if v else "false"), []
+    if isinstance(v, int):
+        return str(v), []
+    if not isinstance(v, str):
+        raise TypeError(f"Cannot emit {type(v).__name__} as YAML")
+    if _PLAIN_SAFE_RE.fullmatch(v) and not v.endswith(" ") and not _IMPLICIT_TYPE_RE.fullmatch(v):
+        return v, []
+    if allow_block and ("\n" in v or isinstance(v, LiteralStr)):
+        # Block literal ('|'), with chomping chosen to round-trip trailing newlines
+        if not v.endswith("\n"):
+            chomp, body = "-", v
+        elif v.endswith("\n\n"):
+            chomp, body = "+", v[:-1]
+        else:
+            chomp, body = "", v[:-1]
+        lines = body.split("\n")
+        first = next((ln for ln in lines if ln), "")
+        if first and not first[0].isspace() and all(ln.replace("\t", "").isprintable() for ln in lines):
+            pad = " " * indent
+            return "|" + chomp, [pad + ln if ln else "" for ln in lines]
+    if v.isprintable():
+        return "'" + v.replace("'", "''") + "'", []
+    return _yaml_double_quoted(v), []
+
+def _emit(obj: Any, out: List[str], indent: int = 0, memo: Optional[Dict[Tuple[int, int], List[str]]] = None) -> None:
+    """
+    Append block-style YAML lines for a dict or list to `out`, PyYAML-style layout.
+    `memo` caches the lines of each emitted (object, indent) for the duration of one
+    dump, so sub-documents shared by reference (e.g. a pipeline's steps, repeated
+    in every stage) are rendered once and copied afterwards.
+    """
+    if memo is not None:
+        key = (id(obj), indent)
+        cached = memo.get(key)
+        if cached is not None:
+            out.extend(cached)
+            return
+        start = len(out)
+    pad = " " * indent
+    if isinstance(obj, dict):
+        for k, v in obj.items():
+            key_text, _ = _yaml_scalar(k, indent, allow_block=False)
+            if isinstance(v, dict) and v:
+                out.append(f"{pad}{key_text}:")
+                _emit(v, out, indent + 2, memo)
+            elif isinstance(v, list) and v:
+                # Sequences under a mapping key are not indented (PyYAML default)
+                out.append(f"{pad}{key_text}:")
+                _emit(v, out, indent, memo)
+            else:
+                text, extra = _scalar_or_empty(v, indent + 2)
+                out.append(f"{pad}{key_text}: {text}")
+                out.extend(extra)
+    else:
+        for item in obj:
+            if isinstance(item, (dict, list)) and item:
+                # First line of the nested block shares the '- ' line
+                item_start = len(out)
+                _emit(item, out, indent + 2, memo)
+                out[item_start] = pad + "- " + out[item_start][indent + 2:]
+            else:
+                text, extra = _scalar_or_empty(item, indent + 2)
+                out.append(f"{pad}- {text}")
+                out.extend(extra)
+    if memo is not None:
+        memo[key] = out[start:]
+
+def _scalar_or_empty(v: Any, indent: int) -> Tuple[str, List[str]]:
+    if isinstance(v, dict):
+        return "{}", []
+    if isinstance(v, list):
+        return "[]", []
+    return _yaml_scalar(v, indent)
+
 def _simple_yaml_dump(data: Any) -> str:
-    """Very small YAML dumper fallback (not full-featured)."""
-    import json as _json
-    # This is a naive conversion; for high-fidelity YAML, install PyYAML.
-    return _json.dumps(data, indent=2)
+    """Small, fast YAML dumper for dict/list/str/int/bool/None documents."""
+    if isinstance(data, (dict, list)) and data:
+        out: List[str] = []
+        _emit(data, out, memo={})
+    else:
+        text, extra = _scalar_or_empty(data, 2)
+        out = [text] + extra
+    return "\n".join(out) + "\n"
 
-def to_yaml(data: Any) -> str:
-    if HAVE_PYYAML:
+def to_yaml(data: Any, fast: bool = False) -> str:
+    if HAVE_PYYAML and not fast:
         # Ensure stable keys and readable multiline strings
-        class LiteralStr(str): pass
-        def _repr_literal(dumper, data):
-            return dumper.represent_scalar('tag:yaml.org,2002:str', data, style='|')
-        yaml.add_representer(LiteralStr, _repr_literal)
-        return yaml.safe_dump(data, sort_keys=False, default_flow_style=False, width=100000)
+        return yaml.dump(data, Dumper=_Dumper, sort_keys=False, default_flow_style=False, width=100000)
     else:
         return _simple_yaml_dump(data)
 
+def write_yaml(path: Path, data: Any, fast: bool = False) -> None:
+    """
+    Serialise `data` with to_yaml, then write it. The text is built before the file
+    is opened, so an emitter error leaves any existing file untouched.
+    """
+    text = to_yaml(data, fast=fast)
+    path.write_text(text, encoding="utf-8")
+
+_NONIDENT_RE = re.compile(r'[^A-Za-z0-9_]+')
+# ASCII fast path: map every non-identifier character to a space in one C-level pass;
+# runs of spaces are then collapsed to a single '_' by split/join.
+_IDENT_TRANS = {c: ' ' for c in range(128) if not (chr(c).isalnum() or chr(c) == '_')}
+
+# Cached because the same service/env/step names recur across every stage of every
+# pipeline. Not strictly pure: a name with no identifier characters falls back to a
+# random id_<hex>, and the cache pins that id per process only until the entry is
+# evicted; after an eviction the same name (e.g. a service file vs. a pipeline's
+# serviceRef) can get a different id.
+@functools.lru_cache(maxsize=8192)
 def sanitize_identifier(name: str) -> str:
-    base = re.sub(r'[^A-Za-z0-9_]+', '_', name.strip())
-    base = re.sub(r'^_+|_+$', '', base)
+    base = name.translate(_IDENT_TRANS) if name.isascii() else _NONIDENT_RE.sub(' ', name)
+    base = "_".join(base.split()).strip('_')
     return base or f"id_{uuid.uuid4().hex[:8]}"
 
 def ensure_dir(p: Path) -> None:
     p.mkdir(parents=True, exist_ok=True)
 
-def unzip_if_needed(input_path: Path) -> Path:
-    if input_path.is_dir():
-        return input_path
-    if input_path.is_file() and input_path.suffix.lower() == ".zip":
-        tmp = Path(tempfile.mkdtemp(prefix="ucd_export_"))
-        with shutil.unpack_archive(str(input_path), str(tmp), format="zip"):
-            # Some archives store all content under a single top folder; normalize
-            # to the single folder if there is exactly one child dir
-            subdirs = [d for d in tmp.iterdir() if d.is_dir()]
-            if len(subdirs) == 1 and not any(p.suffix for p in tmp.iterdir() if p.is_file()):
-                return subdirs[0]
-            return tmp
-    raise FileNotFoundError(f"Input '{input_path}' is neither a directory nor a .zip file.")
-
-def read_all_json(root: Path) -> List[Tuple[Path, Dict[str, Any]]]:
-    items: List[Tuple[Path, Dict[str, Any]]] = []
-    for p in root.rglob("*.json"):
+def iter_json_files(root: Path) -> Iterator[Tuple[Path, int]]:
+    """
+    Yield (path, size in bytes) for every *.json file under `root`, pre-order
+    depth-first: each directory's files, then its subdirectories, both in os.scandir
+    (filesystem) order. The order does not depend on the Python version, but it is
+    not sorted; it is the order downstream "first seen wins" indexing sees.
+    os.scandir avoids building a Path for every non-matching entry and supplies the
+    size; symlinked directories are not followed. Directories that cannot be listed
+    are skipped with a warning; entries that cannot be stat'ed (e.g. dangling
+    symlinks) get size 0 and fail later with the usual warning.
+    """
+    stack = [str(root)]
+    while stack:
+        d = stack.pop()
+        subdirs = []
         try:
-            with p.open("r", encoding="utf-8") as f:
-                obj = json.load(f)
+            with os.scandir(d) as it:
+                entries = list(it)
+        except OSError as e:
+            # Unreadable or vanished directory: skip it, as Path.rglob did
+            print(f"[warn] Skipping unreadable directory: {d} -> {e}", file=sys.stderr)
+            continue
+        for e in entries:
+            if e.is_dir(follow_symlinks=False):
+                subdirs.append(e.path)
+            elif e.name.endswith(".json"):
+                try:
+                    size = e.stat().st_size
+                except OSError:
+                    size = 0
+                yield Path(e.path), size
+        stack.extend(reversed(subdirs))
+
+# Below this much JSON in total, pool startup and pickling each parsed tree back to
+# the parent cost more than the (already fast) parse itself; stay serial.
+_PARALLEL_JSON_MIN_BYTES = 128 * 1024 * 1024
+# Files at least this large are parsed incrementally with ijson (when installed).
+_STREAM_JSON_MIN_BYTES = 64 * 1024 * 1024
+
+def _read_one(p: Path) -> Tuple[Path, Optional[bytes], Any]:
+    """Read one JSON file's bytes; returns (path, data_or_none, error_message_or_none)."""
+    try:
+        return p, p.read_bytes(), None
+    except Exception as e:
+        return p, None, str(e)
+
+def _read_member(zf: zipfile.ZipFile, info: zipfile.ZipInfo, p: Path) -> Tuple[Path, Optional[bytes], Any]:
+    """Read one zip member's bytes (e.g. bad CRC becomes an error); same contract as _read_one."""
+    try:
+        return p, zf.read(info), None
+    except Exception as e:
+        return p, None, str(e)
 
-            # If the file is a dict, keep as-is
-            if isinstance(obj, dict):
-                items.append((p, obj))
+def _parse_one(entry: Tuple[Path, Optional[bytes], Any]) -> Tuple[Path, Any, Any]:
+    """
+    Parse one read result; returns (path, obj_or_none, error_message_or_none). Runs in
+    pool workers, so errors are returned as strings: a JSONDecodeError's .doc would
+    otherwise ship the whole bad file back to the parent.
+    """
+    p, data, err = entry
+    if err is not None:
+        return p, None, err
+    try:
+        return p, _loads(data), None
+    except Exception as e:
+        return p, None, str(e)
 
-            # If the file is a list, expand each dict element
-            elif isinstance(obj, list):
-                for i, entry in enumerate(obj):
-                    if isinstance(entry, dict):
-                        items.append((p.with_name(f"{p.stem}_{i}{p.suffix}"), entry))
-                    else:
-                        print(f"[warn] Skipping non-dict element in list: {p}[{i}]")
+def _load_one(p: Path) -> Tuple[Path, Any, Any]:
+    """Read and parse one JSON file; same contract as _parse_one."""
+    return _parse_one(_read_one(p))
 
+def _stream_json(f: BinaryIO) -> Any:
+    """
+    Incrementally parse a large JSON file with ijson. A top-level array is returned
+    as a lazy iterator over its elements, so only one entry is in memory at a time;
+    an object root is assembled key by key (no raw text buffer); scalars as-is.
+    """
+    events = ijson.parse(f, use_float=True)
+    first = next(events)
+    events = itertools.chain([first], events)
+    if first[1] == "start_array":
+        return ijson.items(events, "item")
+    if first[1] == "start_map":
+        return dict(ijson.kvitems(events, ""))
+    return first[2]
+
+def _expand_json_root(p: Path, obj: Any, items: List[Tuple[Path, Dict[str, Any], str]]) -> None:
+    """Append the dict(s) in one parsed JSON document to `items`."""
+    pstr_lower = str(p).lower()
+
+    # If the file is a dict, keep as-is
+    if isinstance(obj, dict):
+        items.append((p, obj, pstr_lower))
+
+    # If the file is a list (or a streamed array), expand each dict element
+    elif isinstance(obj, (list, Iterator)):
+        for i, entry in enumerate(obj):
+            if isinstance(entry, dict):
+                items.append((p.with_name(f"{p.stem}_{i}{p.suffix}"), entry, pstr_lower))
             else:
-                print(f"[warn] Skipping non-dict JSON root: {p}")
+                print(f"[warn] Skipping non-dict element in list: {p}[{i}]")
 
-        except Exception as e:
-            print(f"[warn] Failed to parse JSON: {p} -> {e}", file=sys.stderr)
+    else:
+        print(f"[warn] Skipping non-dict JSON root: {p}")
 
-    return items
+def read_all_json(root: Path) -> List[Tuple[Path, Dict[str, Any], str]]:
+    """
+    Load every JSON object from an export directory or .zip archive.
+    Returns (path, object, lowercased source path) tuples; the lowercased path is
+    computed once per file and shared by every object expanded from it.
+    """
+    items: List[Tuple[Path, Dict[str, Any], str]] = []
+    with contextlib.ExitStack() as stack:
+        if root.is_dir():
+            files = list(iter_json_files(root))
+            paths = [p for p, _ in files]
+            sizes = [size for _, size in files]
+            open_raw: Callable[[Path], BinaryIO] = lambda p: p.open("rb")
+            read: Callable[[Path], Tuple[Path, Optional[bytes], Any]] = _read_one
+            # Pool workers read the files themselves
+            pool_fn: Callable[[Any], Tuple[Path, Any, Any]] = _load_one
+            to_pool_input: Callable[[Path], Any] = lambda p: p
+        elif root.is_file() and root.suffix.lower() == ".zip":
+            # Zip members are parsed straight from the archive; paths are archive-relative
+            zf = stack.enter_context(zipfile.ZipFile(root))
+            members = {Path(i.filename): i for i in zf.infolist() if i.filename.endswith(".json")}
+            paths = list(members)
+            sizes = [members[p].file_size for p in paths]
+            open_raw = lambda p: zf.open(members[p])
+            read = lambda p: _read_member(zf, members[p], p)
+            # The archive handle stays in this process; workers get the member bytes
+            pool_fn = _parse_one
+            to_pool_input = read
+        else:
+            raise FileNotFoundError(f"Input '{root}' is neither a directory nor a .zip file.")
+
+        streamed = [HAVE_IJSON and size >= _STREAM_JSON_MIN_BYTES for size in sizes]
+        small = [p for p, big in zip(paths, streamed) if not big]
+        small_bytes = sum(size for size, big in zip(sizes, streamed) if not big)
+        if (os.cpu_count() or 1) < 2 or small_bytes < _PARALLEL_JSON_MIN_BYTES:
+            # Lazy: each file/member is read only when the loop below reaches it
+            results = (_parse_one(read(p)) for p in small)
+        else:
+            with ProcessPoolExecutor() as ex:
+                results = iter(list(ex.map(pool_fn, [to_pool_input(p) for p in small], chunksize=16)))
+
+        # Walk in original file order so first-seen objects still win downstream
+        for p, big in zip(paths, streamed):
+            if big:
+                # Expand into a per-file list so a stream that fails part-way is
+                # dropped as a whole, like a file that fails the in-memory parse
+                file_items: List[Tuple[Path, Dict[str, Any], str]] = []
+                try:
+                    with open_raw(p) as f:
+                        _expand_json_root(p, _stream_json(f), file_items)
+                except Exception as e:
+                    print(f"[warn] Failed to parse JSON: {p} -> {e}", file=sys.stderr)
+                    continue
+                items.extend(file_items)
+                continue
+            p, obj, err = next(results)
+            if err is not None:
+                print(f"[warn] Failed to parse JSON: {p} -> {err}", file=sys.stderr)
+                continue
+            _expand_json_root(p, obj, items)
 
+    return items
 
-def detect_kind(obj: Dict[str, Any], path: Path) -> str:
+def detect_kind(obj: Dict[str, Any], path: Path, pstr_lower: Optional[str] = None) -> str:
     # Heuristics across UCD export variants
     for key in ("objectType", "class", "entityType", "type"):
-        if key in obj and isinstance(obj[key], str):
-            v = obj[key].lower()
+        v = obj.get(key)
+        if isinstance(v, str):
+            v = v.lower()
             if "application" in v and "template" not in v:
                 return "application"
             if "component" in v and "template" not in v:
@@ -118,15 +425,15 @@ def detect_kind(obj: Dict[str, Any], path: Path) -> str:
             if "process" in v:
                 return "process"
 
-    # Path-based hints
-    pstr = str(path).lower()
+    # Path-based hints (callers pass the lowercased path when they have it)
+    pstr = pstr_lower if pstr_lower is not None else str(path).lower()
     if "applications" in pstr and "process" not in pstr:
         return "application"
     if "components" in pstr and "template" not in pstr:
         return "component"
     if "environments" in pstr:
         return "environment"
-    if "process" in pstr or "processes" in pstr:
+    if "process" in pstr:  # also covers "processes"
         return "process"
 
     # Key-based hints
@@ -141,65 +448,130 @@ def detect_kind(obj: Dict[str, Any], path: Path) -> str:
 
     return "unknown"
 
+# Candidate name fields, in priority order
+_NAME_KEYS = ("name", "application", "applicationName", "component", "componentName", "environment", "environmentName", "displayName")
+_NAME_KEYS_SET = frozenset(_NAME_KEYS)
+
 def pull_name(obj: Dict[str, Any]) -> str:
-    for k in ("name", "application", "applicationName", "component", "componentName", "environment", "environmentName", "displayName"):
-        if k in obj and isinstance(obj[k], str) and obj[k].strip():
-            return obj[k]
+    cand = obj.keys() & _NAME_KEYS_SET
+    if cand:
+        for k in _NAME_KEYS:
+            if k in cand:
+                v = obj[k]
+                if isinstance(v, str) and v.strip():
+                    return v
     # Fallback: find any 'name' nested
     for k, v in obj.items():
         if isinstance(v, dict) and "name" in v and isinstance(v["name"], str):
             return v["name"]
     return f"unnamed-{uuid.uuid4().hex[:6]}"
 
+def _string_leaves(o: Any, out: List[str]) -> List[str]:
+    """Collect every string value (not key) nested in a JSON-like object into `out`."""
+    if isinstance(o, str):
+        out.append(o)
+    elif isinstance(o, dict):
+        for v in o.values():
+            _string_leaves(v, out)
+    elif isinstance(o, list):
+        for v in o:
+            _string_leaves(v, out)
+    return out
+
+def _build_name_scanner(entries: List[Tuple[str, Any]]) -> Callable[[str], List[Tuple[int, Any]]]:
+    """
+    Build a scanner for case-insensitive "name occurs in text" lookups.
+    `entries` is a priority-ordered list of (name, value); the returned function
+    takes already-lowercased text and returns (priority, value) for every name
+    found in it. Uses a single Aho-Corasick pass over the text when available.
+    """
+    candidates: Dict[str, Tuple[int, Any]] = {}
+    for nm, value in entries:
+        candidates.setdefault(nm.lower(), (len(candidates), value))
+
+    if HAVE_AHOCORASICK and candidates and "" not in candidates:
+        automaton = ahocorasick.Automaton()
+        for key, ranked in candidates.items():
+            automaton.add_word(key, ranked)
+        automaton.make_automaton()
+
+        def scan(text: str) -> List[Tuple[int, Any]]:
+            return [ranked for _, ranked in automaton.iter(text)]
+        return scan
+
+    ordered = list(candidates.items())
+
+    def scan_linear(text: str) -> List[Tuple[int, Any]]:
+        return [ranked for key, ranked in ordered if key in text]
+    return scan_linear
+
+def _build_name_matcher(entries: List[Tuple[str, Any]]) -> Callable[[str], Optional[Any]]:
+    """Like _build_name_scanner, but return only the highest-priority match (or None)."""
+    scan = _build_name_scanner(entries)
+
+    def match(text: str) -> Optional[Any]:
+        hits = scan(text)
+        return min(hits, key=lambda ranked: ranked[0])[1] if hits else None
+    return match
+
 def flatten_process_steps(obj: Dict[str, Any]) -> List[Dict[str, Any]]:
     """
     Extract a linear list of steps from a UCD process (best effort).
     UCD processes can be graphs; we output a readable sequence of placeholders.
     """
-    steps: List[Dict[str, Any]] = []
-
-    def visit(node: Dict[str, Any]):
-        if not isinstance(node, dict): return
-        # Common UCD fields
-        step_name = node.get("name") or node.get("commandName") or node.get("type") or "Step"
-        props = node.get("properties") or node.get("propDefs") or {}
-        desc = node.get("description") or ""
-        steps.append({
-            "name": str(step_name),
-            "description": str(desc),
-            "properties": props if isinstance(props, dict) else {},
-        })
-        # Explore children
-        for child_key in ("children", "next", "steps", "activities"):
-            child = node.get(child_key)
-            if isinstance(child, list):
-                for c in child:
-                    visit(c)
-            elif isinstance(child, dict):
-                visit(child)
-
     # Entry points in various export shapes
     if isinstance(obj.get("rootActivity"), dict):
-        visit(obj["rootActivity"])
+        roots = [obj["rootActivity"]]
     elif isinstance(obj.get("steps"), list):
-        for s in obj["steps"]:
-            visit(s)
+        roots = obj["steps"]
     elif isinstance(obj.get("activities"), list):
-        for s in obj["activities"]:
-            visit(s)
+        roots = obj["activities"]
     else:
         # No obvious structure; treat whole object as one step
-        visit(obj)
+        roots = [obj]
 
-    # Deduplicate by order/name combo to avoid loops
+    # Iterative pre-order DFS; id()-based visited set breaks cycles and shared nodes
+    steps: List[Dict[str, Any]] = []
     seen = set()
-    uniq = []
-    for s in steps:
-        k = (s["name"], json.dumps(s["properties"], sort_keys=True))
-        if k not in seen:
+    visited_ids = set()
+    stack = list(reversed(roots))
+    while stack:
+        node = stack.pop()
+        if not isinstance(node, dict) or id(node) in visited_ids:
+            continue
+        visited_ids.add(id(node))
+        # Common UCD fields
+        step_name = str(node.get("name") or node.get("commandName") or node.get("type") or "Step")
+        props = node.get("properties") or node.get("propDefs") or {}
+        if not isinstance(props, dict):
+            props = {}
+        desc = node.get("description") or ""
+
+        # Drop duplicate-content steps when properties are hashable; otherwise keep them
+        try:
+            k = (step_name, tuple(sorted(props.items())))
+            dup = k in seen
             seen.add(k)
-            uniq.append(s)
-    return uniq
+        except TypeError:
+            dup = False
+        if not dup:
+            steps.append({
+                "name": step_name,
+                "description": str(desc),
+                "properties": props,
+            })
+
+        # Explore children (pushed in reverse so they pop in document order)
+        children: List[Any] = []
+        for child_key in ("children", "next", "steps", "activities"):
+            child = node.get(child_key)
+            if isinstance(child, list):
+                children.extend(child)
+            elif isinstance(child, dict):
+                children.append(child)
+        stack.extend(reversed(children))
+
+    return steps
 
 def build_service_yaml(name: str, project: str, org: str, deployment_type: str) -> Dict[str, Any]:
     identifier = sanitize_identifier(name)
@@ -239,11 +611,11 @@ def step_to_shellscript_yaml(step: Dict[str, Any]) -> Dict[str, Any]:
     properties = step.get("properties", {})
     comment_lines = ["# UCD Step Placeholder", f"# Original Name: {name}"]
     if properties:
-        for k, v in list(properties.items())[:20]:
-            comment_lines.append(f"# {k}: {v}")
+        comment_lines.extend(f"# {k}: {v}" for k, v in itertools.islice(properties.items(), 20))
         if len(properties) > 20:
             comment_lines.append("# ... (truncated)")
-    script = "\n".join(comment_lines + ["echo \"Executing placeholder for UCD step: {}\"".format(name)])
+    comment_lines.append("echo \"Executing placeholder for UCD step: {}\"".format(name))
+    script = "\n".join(comment_lines)
     return {
         "step": {
             "type": "ShellScript",
@@ -264,13 +636,14 @@ def build_pipeline_yaml(app_name: str, env_name: str, service_names: List[str],
     app_id = sanitize_identifier(app_name)
     env_id = sanitize_identifier(env_name)
     stages = []
+    # Steps are identical for every stage; convert them once and share the list
+    exec_steps = [step_to_shellscript_yaml(s) for s in process_steps] or [
+        step_to_shellscript_yaml({"name": "Deploy Placeholder"})
+    ]
 
     # One Deployment stage per service (simple sequence). Attach steps from process, if any.
     for svc in service_names or ["PlaceholderService"]:
         svc_id = sanitize_identifier(svc)
-        exec_steps = [step_to_shellscript_yaml(s) for s in process_steps] or [
-            step_to_shellscript_yaml({"name": "Deploy Placeholder"})
-        ]
         stages.append({
             "stage": {
                 "name": f"Deploy {svc}",
@@ -305,6 +678,7 @@ def main():
     ap.add_argument("--project-id", default="UCD_MIGRATED", help="Harness Project identifier")
     ap.add_argument("--org-id", default="default", help="Harness Org identifier")
     ap.add_argument("--deployment-type", default="Kubernetes", choices=["Kubernetes", "Ssh", "NativeHelm", "ServerlessAwsLambda", "AzureWebApp"], help="Harness deployment type to seed")
+    ap.add_argument("--fast-yaml", action="store_true", help="Use the built-in YAML writer instead of PyYAML (faster; scripts emitted as '|' blocks)")
     ap.add_argument("--dry-run", action="store_true", help="Scan and print what would be generated, but do not write files")
     args = ap.parse_args()
 
@@ -313,8 +687,7 @@ def main():
     if not args.dry_run:
         ensure_dir(out_dir)
 
-    export_root = unzip_if_needed(in_path)
-    items = read_all_json(export_root)
+    items = read_all_json(in_path)
 
     applications = {}
     components = {}
@@ -322,8 +695,8 @@ def main():
     processes = []  # (name, json)
 
     # Index objects by kind and name
-    for p, obj in items:
-        kind = detect_kind(obj, p)
+    for p, obj, pstr_lower in items:
+        kind = detect_kind(obj, p, pstr_lower)
         name = pull_name(obj)
         if kind == "application":
             applications[name] = obj
@@ -337,10 +710,14 @@ def main():
     # Associate process lists by app/component where possible (best-effort string matching)
     app_process_map: Dict[str, List[Dict[str, Any]]] = {k: [] for k in applications.keys()}
     comp_process_map: Dict[str, List[Dict[str, Any]]] = {k: [] for k in components.keys()}
+    # Applications take priority over components, matching the explicit-field order
+    match_owner = _build_name_matcher(
+        [(a, ("app", a)) for a in applications.keys()] +
+        [(c, ("comp", c)) for c in components.keys()]
+    )
     for pname, pobj in processes:
         # Try to find owner by common fields or text
         owner = None
-        text = json.dumps(pobj).lower()
         # Explicit fields
         for key in ("application", "applicationName"):
             if key in pobj and isinstance(pobj[key], str):
@@ -352,13 +729,8 @@ def main():
                 break
         # Heuristic via name or text
         if owner is None:
-            for a in applications.keys():
-                if a.lower() in (pname.lower() + " " + text):
-                    owner = ("app", a); break
-        if owner is None:
-            for c in components.keys():
-                if c.lower() in (pname.lower() + " " + text):
-                    owner = ("comp", c); break
+            buf = " ".join(_string_leaves(pobj, [pname])).lower()
+            owner = match_owner(buf)
 
         steps = flatten_process_steps(pobj)
         if owner and owner[0] == "app":
@@ -388,10 +760,16 @@ def main():
     # Pick/derive one environment per app (if none, create placeholder)
     app_env: Dict[str, str] = {}
     env_names = list(environments.keys()) or ["PlaceholderEnv"]
-    for app in applications.keys() or ["PlaceholderApp"]:
-        # Prefer env whose name contains app name
-        match = next((e for e in env_names if app.lower() in e.lower()), None)
-        app_env[app] = match or env_names[0]
+    app_list = list(applications.keys()) or ["PlaceholderApp"]
+    # Prefer the first env whose name contains the app name: scan each env name once
+    # for all app names, rather than testing every app against every env.
+    scan_apps = _build_name_scanner([(a, a.lower()) for a in app_list])
+    env_by_app_lower: Dict[str, str] = {}
+    for e in env_names:
+        for _, app_lower in scan_apps(e.lower()):
+            env_by_app_lower.setdefault(app_lower, e)
+    for app in app_list:
+        app_env[app] = env_by_app_lower.get(app.lower(), env_names[0])
 
     # DRY RUN: summary
     if args.dry_run:
@@ -419,12 +797,12 @@ def main():
     # Services from components
     for comp_name in (components.keys() or ["PlaceholderService"]):
         svc_yaml = build_service_yaml(comp_name, args.project_id, args.org_id, args.deployment_type)
-        (dirs["services"] / f"{sanitize_identifier(comp_name)}.yaml").write_text(to_yaml(svc_yaml), encoding="utf-8")
+        write_yaml(dirs["services"] / f"{sanitize_identifier(comp_name)}.yaml", svc_yaml, fast=args.fast_yaml)
 
     # Environments
     for env_name in (environments.keys() or ["PlaceholderEnv"]):
         env_yaml = build_environment_yaml(env_name, args.project_id, args.org_id)
-        (dirs["environments"] / f"{sanitize_identifier(env_name)}.yaml").write_text(to_yaml(env_yaml), encoding="utf-8")
+        write_yaml(dirs["environments"] / f"{sanitize_identifier(env_name)}.yaml", env_yaml, fast=args.fast_yaml)
 
     # Pipelines per application (or one placeholder)
     apps = applications.keys() or ["PlaceholderApp"]
@@ -433,7 +811,7 @@ def main():
         proc_steps = app_process_map.get(app_name, [])
         services = app_services.get(app_name, list(components.keys()))
         pipe_yaml = build_pipeline_yaml(app_name, env_name, services, proc_steps, args.project_id, args.org_id, args.deployment_type)
-        (dirs["pipelines"] / f"{sanitize_identifier(app_name)}.yaml").write_text(to_yaml(pipe_yaml), encoding="utf-8")
+        write_yaml(dirs["pipelines"] / f"{sanitize_identifier(app_name)}.yaml", pipe_yaml, fast=args.fast_yaml)
 
     # README
     readme = f"""# Harness YAMLs generated from UCD export